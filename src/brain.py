@@ -1,12 +1,14 @@
 """OpenAI-powered conversation brain."""
 
+import functools
+import io
 import logging
-import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import AsyncIterator
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from src.config import settings
 
@@ -24,9 +26,34 @@ Keep your responses conversational and concise - this is a phone call, not a tex
 
 When ending a call, say goodbye naturally."""
 
+# Punctuation that ends a sentence when followed by whitespace
+_SENTENCE_ENDINGS = frozenset(".!?")
 
+# Words whose trailing period doesn't end a sentence
+_ABBREVIATIONS = frozenset({"Dr.", "Mr.", "Mrs.", "Ms.", "Jr.", "Sr.", "St."})
+
+# Shorter sentences are merged into the next one to avoid tiny TTS requests
+_MIN_SENTENCE_LENGTH = 10
+
+
+def _find_sentence_end(text: str, start: int) -> int:
+    """Find punctuation followed by whitespace in text[start:], or return -1."""
+    # str.find scans in C; only the few punctuation hits are checked in Python
+    last = len(text) - 1  # final char has nothing after it yet
+    while start < last:
+        hits = [text.find(c, start, last) for c in _SENTENCE_ENDINGS]
+        pos = min((i for i in hits if i != -1), default=-1)
+        if pos == -1:
+            return -1
+        if text[pos + 1].isspace():
+            return pos
+        start = pos + 1
+    return -1
+
+
+@functools.cache
 def load_system_prompt() -> str:
-    """Load the system prompt from file or use default."""
+    """Load the system prompt from file or use default (read once per process)."""
     prompt_path = Path(settings.system_prompt_path)
 
     if prompt_path.exists():
@@ -51,40 +78,65 @@ class Conversation:
 
     messages: list[Message] = field(default_factory=list)
     system_prompt: str = field(default_factory=load_system_prompt)
+    # API-format messages, kept in sync as messages are added
+    _api_messages: list[dict] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._api_messages = [{"role": "system", "content": self.system_prompt}]
+        self._api_messages.extend(
+            {"role": m.role, "content": m.content} for m in self.messages
+        )
 
     def add_user_message(self, text: str) -> None:
         """Add a user (caller) message to history."""
         # Merge consecutive user messages (API requires alternating roles)
         if self.messages and self.messages[-1].role == "user":
             self.messages[-1].content += " " + text
+            self._api_messages[-1]["content"] = self.messages[-1].content
         else:
             self.messages.append(Message(role="user", content=text))
+            self._api_messages.append({"role": "user", "content": text})
 
     def add_assistant_message(self, text: str) -> None:
         """Add an assistant response to history."""
         self.messages.append(Message(role="assistant", content=text))
+        self._api_messages.append({"role": "assistant", "content": text})
 
     def to_api_format(self) -> list[dict]:
         """Convert messages to OpenAI API format (includes system message)."""
-        messages = [{"role": "system", "content": self.system_prompt}]
-        messages.extend({"role": m.role, "content": m.content} for m in self.messages)
-        return messages
+        # Shallow copy: callers may add to the list without touching history
+        return list(self._api_messages)
 
     def get_transcript(self) -> str:
         """Get a formatted transcript of the conversation."""
-        lines = []
+        buf = io.StringIO()
+        separator = ""
         for msg in self.messages:
             speaker = "Caller" if msg.role == "user" else "Assistant"
-            lines.append(f"{speaker}: {msg.content}")
-        return "\n".join(lines)
+            buf.write(separator)
+            buf.write(speaker)
+            buf.write(": ")
+            buf.write(msg.content)
+            separator = "\n"
+        return buf.getvalue()
 
 
 class OpenAIBrain:
     """OpenAI-powered conversation handler with streaming."""
 
     def __init__(self):
-        self._client = AsyncOpenAI(api_key=settings.openai_api_key)
-        self._sentence_pattern = re.compile(r"([.!?]+)\s*")
+        # One pooled HTTP/2 client shared by all calls, so streaming requests
+        # reuse warm connections instead of opening new TLS sessions
+        self._client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=500,
+                    max_keepalive_connections=200,
+                ),
+            ),
+        )
 
     async def respond(self, conversation: Conversation) -> str:
         """
@@ -142,7 +194,11 @@ class OpenAIBrain:
         Yields:
             Complete sentences as they become available.
         """
-        buffer = ""
+        # Tokens are collected in a list and only joined when a sentence
+        # boundary can have arrived, so long responses stay linear.
+        buffer_parts: list[str] = []
+        scan_start = 0
+        boundary_pending = False  # buffer ends with punctuation
 
         stream = await self._client.chat.completions.create(
             model=settings.openai_model,
@@ -154,25 +210,39 @@ class OpenAIBrain:
         async for chunk in stream:
             content = chunk.choices[0].delta.content
             if content:
-                buffer += content
-
-                # Check for complete sentences
-                while True:
-                    match = self._sentence_pattern.search(buffer)
-                    if match:
-                        # Found end of sentence
-                        end_pos = match.end()
-                        sentence = buffer[:end_pos].strip()
-                        buffer = buffer[end_pos:]
-
-                        if sentence:
-                            yield sentence
-                    else:
-                        break
+                buffer_parts.append(content)
+
+                # No punctuation in (or just before) this token means no new sentence
+                if not boundary_pending and _SENTENCE_ENDINGS.isdisjoint(content):
+                    continue
+
+                buffer = "".join(buffer_parts)
+
+                # Scan only the characters not checked on a previous token
+                start = 0
+                end_pos = _find_sentence_end(buffer, scan_start)
+                while end_pos != -1:
+                    # Found end of sentence - unless it's an abbreviation or a
+                    # fragment too short to be worth its own TTS request
+                    sentence = buffer[start : end_pos + 1].strip()
+                    if (
+                        len(sentence) >= _MIN_SENTENCE_LENGTH
+                        and sentence.rsplit(maxsplit=1)[-1] not in _ABBREVIATIONS
+                    ):
+                        yield sentence
+                        start = end_pos + 2
+
+                    end_pos = _find_sentence_end(buffer, end_pos + 1)
+
+                buffer = buffer[start:]
+                buffer_parts = [buffer] if buffer else []
+                scan_start = max(len(buffer) - 1, 0)
+                boundary_pending = buffer[-1:] in _SENTENCE_ENDINGS
 
         # Yield any remaining text
-        if buffer.strip():
-            yield buffer.strip()
+        remaining = "".join(buffer_parts).strip()
+        if remaining:
+            yield remaining
 
 
 # Singleton instance
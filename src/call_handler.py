@@ -1,23 +1,24 @@
 """Call handler - orchestrates the full audio pipeline for a single call."""
 
 import asyncio
-import base64
-import json
 import logging
 import random
 import time
+from binascii import a2b_base64, b2a_base64
+from contextlib import aclosing
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 
+import orjson
 from fastapi import WebSocket
 
 from src.brain import Conversation, get_brain
 from src.config import settings
 from src.stt import DeepgramSTT, TranscriptEvent
-from src.tts import get_tts
+from src.tts import DeepgramTTS, get_tts
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,64 @@ class CallState(Enum):
     ENDED = "ended"
 
 
+async def _split_audio(
+    audio_stream: AsyncIterator[bytes], chunk_size: int
+) -> AsyncIterator[bytes | memoryview]:
+    """Re-chunk streamed audio into fixed-size frames (last one may be short)."""
+    # Frames are memoryview slices of the received data where possible;
+    # only frames that straddle two received chunks are copied.
+    pending = b""
+    async with aclosing(audio_stream):
+        async for data in audio_stream:
+            view = memoryview(data)
+            offset = 0
+
+            if pending:
+                offset = chunk_size - len(pending)
+                if len(view) < offset:
+                    pending += data
+                    continue
+                yield pending + view[:offset]
+
+            while offset + chunk_size <= len(view):
+                yield view[offset : offset + chunk_size]
+                offset += chunk_size
+            pending = bytes(view[offset:])
+    if pending:
+        yield pending
+
+
+class SpeechJob:
+    """Text queued for playback, with TTS synthesis started ahead of time."""
+
+    def __init__(self, text: str, tts: DeepgramTTS):
+        self.text = text
+        self._chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._synthesize(tts))
+
+    async def _synthesize(self, tts: DeepgramTTS) -> None:
+        """Buffer streamed TTS audio until it is played."""
+        try:
+            async for chunk in tts.synthesize_streaming(self.text):
+                self._chunks.put_nowait(chunk)
+        finally:
+            self._chunks.put_nowait(None)  # end of audio
+
+    async def audio(self) -> AsyncIterator[bytes]:
+        """Yield synthesized audio, waiting for chunks still in flight."""
+        try:
+            while (chunk := await self._chunks.get()) is not None:
+                yield chunk
+            # Re-raise any synthesis error
+            await self._task
+        finally:
+            self._task.cancel()
+
+    def cancel(self) -> None:
+        """Abandon synthesis (speech will not be played)."""
+        self._task.cancel()
+
+
 @dataclass
 class CallMetadata:
     """Metadata about the current call."""
@@ -68,9 +127,23 @@ class CallHandler:
         # State management
         self._current_utterance = ""
         self._is_speaking = False
-        self._speech_queue: asyncio.Queue[str] = asyncio.Queue()
+        self._speech_queue: asyncio.Queue[SpeechJob] = asyncio.Queue()
         self._stop_speaking = asyncio.Event()
         self._tasks: list[asyncio.Task] = []
+        self._utterance_tasks: set[asyncio.Task] = set()  # in-flight responses
+
+        # Outbound media frame JSON, split around the payload (set on "start")
+        self._media_prefix = b""
+        self._media_suffix = b'"}}'
+
+        # Twilio event dispatch ("media" arrives every 20ms)
+        self._event_handlers = {
+            "media": self._handle_media,
+            "start": self._handle_start,
+            "stop": self._handle_stop,
+            "mark": self._handle_mark,
+            "connected": self._handle_connected,
+        }
 
         # Silence detection
         self._last_speech_time: float = 0
@@ -101,59 +174,68 @@ class CallHandler:
         """Process incoming WebSocket messages from Twilio."""
         async for message in self.ws.iter_text():
             try:
-                data = json.loads(message)
+                data = orjson.loads(message)
                 await self._handle_twilio_message(data)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.warning(f"Invalid JSON from Twilio: {message[:100]}")
             except Exception as e:
                 logger.error(f"Error handling Twilio message: {e}")
 
     async def _handle_twilio_message(self, data: dict) -> None:
         """Handle a single message from Twilio."""
-        event_type = data.get("event")
-
-        if event_type == "connected":
-            logger.info("Twilio connected")
-
-        elif event_type == "start":
-            # Call is starting - extract metadata
-            start_data = data.get("start", {})
-            self.metadata.call_sid = start_data.get("callSid", "")
-            self.metadata.stream_sid = start_data.get("streamSid", "")
-
-            custom_params = start_data.get("customParameters", {})
-            self.metadata.caller = custom_params.get("caller", "Unknown")
-            self.metadata.called = custom_params.get("called", "")
-
-            logger.info(
-                f"Call started: {self.metadata.call_sid} "
-                f"from {self.metadata.caller}"
-            )
-
-            self.state = CallState.GREETING
-            # Send initial greeting
-            await self._speak_greeting()
+        handler = self._event_handlers.get(data.get("event"))
+        if handler:
+            await handler(data)
+
+    async def _handle_media(self, data: dict) -> None:
+        """Audio data from caller."""
+        media = data.get("media", {})
+        payload = media.get("payload", "")
+
+        if payload:
+            # Decode and forward raw mulaw to STT (which batches sends)
+            await self.stt.send_audio(a2b_base64(payload))
+
+    async def _handle_start(self, data: dict) -> None:
+        """Call is starting - extract metadata."""
+        start_data = data.get("start", {})
+        self.metadata.call_sid = start_data.get("callSid", "")
+        self.metadata.stream_sid = start_data.get("streamSid", "")
+        self._media_prefix = (
+            '{"event":"media","streamSid":"'
+            + self.metadata.stream_sid
+            + '","media":{"payload":"'
+        ).encode()
+
+        custom_params = start_data.get("customParameters", {})
+        self.metadata.caller = custom_params.get("caller", "Unknown")
+        self.metadata.called = custom_params.get("called", "")
+
+        logger.info(
+            f"Call started: {self.metadata.call_sid} "
+            f"from {self.metadata.caller}"
+        )
 
-        elif event_type == "media":
-            # Audio data from caller
-            media = data.get("media", {})
-            payload = media.get("payload", "")
+        self.state = CallState.GREETING
+        # Send initial greeting
+        await self._speak_greeting()
 
-            if payload:
-                # Forward to STT
-                await self.stt.send_audio_base64(payload)
+    async def _handle_stop(self, data: dict) -> None:
+        """Call ended by Twilio."""
+        logger.info("Call ended by Twilio")
+        self.state = CallState.ENDED
 
-        elif event_type == "stop":
-            logger.info("Call ended by Twilio")
-            self.state = CallState.ENDED
+    async def _handle_mark(self, data: dict) -> None:
+        """A mark we sent was reached (audio playback milestone)."""
+        mark_name = data.get("mark", {}).get("name", "")
+        logger.debug(f"Mark reached: {mark_name}")
 
-        elif event_type == "mark":
-            # A mark we sent was reached (audio playback milestone)
-            mark_name = data.get("mark", {}).get("name", "")
-            logger.debug(f"Mark reached: {mark_name}")
+        if mark_name == "greeting_end":
+            self.state = CallState.LISTENING
 
-            if mark_name == "greeting_end":
-                self.state = CallState.LISTENING
+    async def _handle_connected(self, data: dict) -> None:
+        """Twilio WebSocket connected."""
+        logger.info("Twilio connected")
 
     def _on_transcript(self, event: TranscriptEvent) -> None:
         """Callback when STT produces a transcript."""
@@ -165,8 +247,10 @@ class CallHandler:
         self._silence_prompted = False
 
         logger.debug(
-            f"Transcript: '{event.text}' "
-            f"(final={event.is_final}, speech_final={event.speech_final})"
+            "Transcript: '%s' (final=%s, speech_final=%s)",
+            event.text,
+            event.is_final,
+            event.speech_final,
         )
 
         if event.is_final:
@@ -176,7 +260,9 @@ class CallHandler:
                 # End of caller's turn - process the complete utterance
                 utterance = self._current_utterance.strip()
                 if utterance:
-                    asyncio.create_task(self._process_utterance(utterance))
+                    task = asyncio.create_task(self._process_utterance(utterance))
+                    self._utterance_tasks.add(task)
+                    task.add_done_callback(self._utterance_tasks.discard)
                 self._current_utterance = ""
         else:
             # Interim result - if we're speaking and caller interrupts
@@ -202,23 +288,32 @@ class CallHandler:
 
             async for sentence in self.brain.respond_by_sentence(self.conversation):
                 full_response += sentence + " "
-                # Queue sentence for TTS
-                await self._speech_queue.put(sentence)
+                # Queue sentence for TTS (synthesis starts right away)
+                await self._queue_speech(sentence)
 
             # Record assistant response in conversation
             self.conversation.add_assistant_message(full_response.strip())
 
         except Exception as e:
             logger.error(f"Error generating response: {e}")
-            await self._speech_queue.put(
+            await self._queue_speech(
                 "I'm sorry, I'm having trouble understanding. "
                 "Could you please repeat that?"
             )
 
+    async def _queue_speech(self, text: str) -> None:
+        """Queue text for playback, starting its TTS synthesis immediately."""
+        # Nothing will play it once the call has ended - don't pay for synthesis
+        if self.state == CallState.ENDED:
+            return
+
+        tts = await get_tts()
+        await self._speech_queue.put(SpeechJob(text, tts))
+
     async def _speak_greeting(self) -> None:
         """Speak the initial greeting."""
         greeting = f"Hello, this is {settings.agent_name}. How can I help you?"
-        await self._speech_queue.put(greeting)
+        await self._queue_speech(greeting)
         self.conversation.add_assistant_message(greeting)
         self._last_speech_time = time.time()
 
@@ -246,7 +341,7 @@ class CallHandler:
                     if silence_duration >= self._silence_timeout:
                         logger.info(f"Silence detected ({silence_duration:.1f}s), prompting")
                         prompt = random.choice(silence_prompts)
-                        await self._speech_queue.put(prompt)
+                        await self._queue_speech(prompt)
                         self.conversation.add_assistant_message(prompt)
                         self._silence_prompted = True
                         self._last_speech_time = time.time()
@@ -258,12 +353,10 @@ class CallHandler:
 
     async def _speech_sender(self) -> None:
         """Background task that sends TTS audio to Twilio."""
-        tts = await get_tts()
-
         while self.state != CallState.ENDED:
             try:
-                # Wait for text to speak
-                text = await asyncio.wait_for(
+                # Wait for speech to play
+                job = await asyncio.wait_for(
                     self._speech_queue.get(),
                     timeout=1.0,
                 )
@@ -272,11 +365,10 @@ class CallHandler:
                 self._stop_speaking.clear()
                 self.state = CallState.SPEAKING
 
-                logger.info(f"Speaking: '{text}'")
+                logger.info(f"Speaking: '{job.text}'")
 
-                # Generate and send TTS audio
-                audio_data = await tts.synthesize(text)
-                await self._send_audio_to_twilio(audio_data)
+                # Stream TTS audio to Twilio as it is synthesized
+                await self._send_audio_to_twilio(job.audio())
 
                 self._is_speaking = False
 
@@ -292,50 +384,54 @@ class CallHandler:
                 logger.error(f"Error in speech sender: {e}")
                 self._is_speaking = False
 
-    async def _send_audio_to_twilio(self, audio_data: bytes) -> None:
-        """Send audio data to Twilio Media Streams."""
-        # Split into chunks and send
+    async def _send_audio_to_twilio(self, audio_stream: AsyncIterator[bytes]) -> None:
+        """Send streamed audio data to Twilio Media Streams."""
         chunk_size = 640  # ~40ms of audio at 8kHz mulaw
-        offset = 0
-
-        while offset < len(audio_data):
-            if self._stop_speaking.is_set():
-                logger.info("Speech interrupted, stopping audio")
-                # Clear the queue
-                while not self._speech_queue.empty():
-                    try:
-                        self._speech_queue.get_nowait()
-                    except asyncio.QueueEmpty:
-                        break
-                # Send clear message to Twilio
-                await self._send_twilio_clear()
-                return
-
-            chunk = audio_data[offset : offset + chunk_size]
-            offset += chunk_size
-
-            # Encode and send
-            payload = base64.b64encode(chunk).decode("utf-8")
-            message = {
-                "event": "media",
-                "streamSid": self.metadata.stream_sid,
-                "media": {"payload": payload},
-            }
-
-            try:
-                await self.ws.send_text(json.dumps(message))
-            except Exception as e:
-                logger.warning(f"Failed to send audio: {e}")
-                return
-
-            # Small delay to pace audio
-            await asyncio.sleep(0.02)
+        frame_interval = 0.02
+
+        # Pace against a fixed schedule so sleep overshoot doesn't accumulate
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        frames_sent = 0
+
+        async with aclosing(_split_audio(audio_stream, chunk_size)) as chunks:
+            async for chunk in chunks:
+                if self._stop_speaking.is_set():
+                    logger.info("Speech interrupted, stopping audio")
+                    self._clear_speech_queue()
+                    # Send clear message to Twilio
+                    await self._send_twilio_clear()
+                    return
+
+                # Encode and send (base64 needs no JSON escaping)
+                # Built as bytes and decoded once; Twilio expects text frames
+                payload = b2a_base64(chunk, newline=False)
+                message = (self._media_prefix + payload + self._media_suffix).decode("ascii")
+
+                try:
+                    await self.ws.send_text(message)
+                except Exception as e:
+                    logger.warning(f"Failed to send audio: {e}")
+                    return
+
+                # Wait until this frame's slot on the schedule
+                frames_sent += 1
+                delay = start_time + frames_sent * frame_interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+    def _clear_speech_queue(self) -> None:
+        """Drop all queued speech and stop synthesizing it."""
+        # Swap in a fresh queue so nothing new lands in the one being emptied
+        pending, self._speech_queue = self._speech_queue, asyncio.Queue()
+        while not pending.empty():
+            pending.get_nowait().cancel()
 
     async def _send_twilio_clear(self) -> None:
         """Send clear message to stop Twilio audio playback."""
         message = {"event": "clear", "streamSid": self.metadata.stream_sid}
         try:
-            await self.ws.send_text(json.dumps(message))
+            await self.ws.send_text(orjson.dumps(message).decode())
         except Exception as e:
             logger.warning(f"Failed to send clear: {e}")
 
@@ -347,7 +443,7 @@ class CallHandler:
             "mark": {"name": name},
         }
         try:
-            await self.ws.send_text(json.dumps(message))
+            await self.ws.send_text(orjson.dumps(message).decode())
         except Exception as e:
             logger.warning(f"Failed to send mark: {e}")
 
@@ -356,13 +452,14 @@ class CallHandler:
         logger.info("Cleaning up call handler")
         self.state = CallState.ENDED
 
-        # Cancel background tasks
-        for task in self._tasks:
+        # Cancel background tasks and in-flight responses, and wait for them together
+        tasks = [*self._tasks, *self._utterance_tasks]
+        for task in tasks:
             task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Stop synthesis of any speech that was never played
+        self._clear_speech_queue()
 
         # Close STT
         await self.stt.close()
@@ -375,8 +472,8 @@ class CallHandler:
         if not self.conversation.messages:
             return
 
+        # Directory is created at startup (see main.lifespan)
         transcript_dir = Path(settings.transcripts_dir)
-        transcript_dir.mkdir(exist_ok=True)
 
         timestamp = self.metadata.start_time.strftime("%Y%m%d_%H%M%S")
         filename = f"call_{timestamp}_{self.metadata.call_sid[:8]}.txt"
@@ -394,5 +491,11 @@ class CallHandler:
             f"{self.conversation.get_transcript()}\n"
         )
 
-        filepath.write_text(content)
+        # Write off the event loop so other calls keep streaming audio
+        try:
+            await asyncio.to_thread(filepath.write_text, content)
+        except FileNotFoundError:
+            # Directory removed while the server was running
+            logger.error(f"Transcript not saved, {transcript_dir} does not exist")
+            return
         logger.info(f"Transcript saved to {filepath}")
@@ -7,6 +7,7 @@ FastAPI application that handles:
 - Integration with Deepgram (STT/TTS) and OpenAI (brain)
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -37,6 +38,10 @@ async def lifespan(app: FastAPI):
     logger.info("Phone Agent starting up...")
     logger.info(f"Server will run on {settings.host}:{settings.port}")
 
+    # uvicorn picks uvloop when it's installed (via uvicorn[standard])
+    loop = asyncio.get_running_loop()
+    logger.info(f"Event loop: {type(loop).__module__}.{type(loop).__name__}")
+
     # Validate required API keys
     if not settings.deepgram_api_key:
         logger.error("DEEPGRAM_API_KEY is not set! Check your .env file.")
@@ -50,6 +55,9 @@ async def lifespan(app: FastAPI):
     oai_preview = settings.openai_api_key[:8] + "..."
     logger.info(f"API keys loaded - Deepgram: {dg_preview}, OpenAI: {oai_preview}")
 
+    # Create the transcripts directory once rather than on every call
+    settings.transcripts_dir.mkdir(exist_ok=True)
+
     # Start ngrok tunnel
     tunnel = None
     if settings.ngrok_enabled:
@@ -1,12 +1,13 @@
 """Deepgram Speech-to-Text integration via WebSocket."""
 
 import asyncio
-import base64
-import json
+import binascii
+import inspect
 import logging
 from dataclasses import dataclass
-from typing import AsyncIterator, Callable
+from typing import AsyncIterator, Awaitable, Callable
 
+import orjson
 import websockets
 from websockets.asyncio.client import ClientConnection
 
@@ -14,8 +15,23 @@ from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Control message asking Deepgram to finish and close the stream. Kept as
+# str so it goes out as a text frame (binary frames are treated as audio).
+_CLOSE_FRAME = '{"type":"CloseStream"}'
 
-@dataclass
+# Outbound audio batching: send once 60ms of 8kHz mulaw is queued, or when
+# the oldest queued audio has waited the max delay (seconds)
+_SEND_BATCH_BYTES = 480
+_SEND_MAX_DELAY = 0.04
+_SEND_BUF_BYTES = 2048
+_WRITER_CLOSE_TIMEOUT = 1.0
+
+# Substrings identifying the message types worth parsing
+_RESULTS_MARKER = b'"Results"'
+_UTTERANCE_END_MARKER = b'"UtteranceEnd"'
+
+
+@dataclass(slots=True, frozen=True)
 class TranscriptEvent:
     """A transcription event from Deepgram."""
 
@@ -25,24 +41,84 @@ class TranscriptEvent:
     confidence: float
 
 
+def _parse_results(data: dict) -> TranscriptEvent | None:
+    """Parse a Results message (interim or final transcript)."""
+    # Results always have this shape; index directly and treat a
+    # malformed message as having no transcript
+    try:
+        best = data["channel"]["alternatives"][0]
+        transcript = best["transcript"]
+        if not transcript or transcript.isspace():
+            return None
+
+        return TranscriptEvent(
+            # strip() returns the same object when there's nothing to strip
+            text=transcript.strip(),
+            is_final=data["is_final"],
+            speech_final=data["speech_final"],
+            confidence=best["confidence"],
+        )
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def _parse_utterance_end(data: dict) -> None:
+    """Handle an UtteranceEnd message (end of a speech turn)."""
+    logger.debug("Utterance end detected")
+    return None
+
+
+def _ignore_message(data: dict) -> None:
+    """Handle a message type that carries nothing we use."""
+    return None
+
+
+# Deepgram message type -> parser; unknown types are ignored
+_MESSAGE_PARSERS: dict[str, Callable[[dict], TranscriptEvent | None]] = {
+    "Results": _parse_results,
+    "UtteranceEnd": _parse_utterance_end,
+    "Metadata": _ignore_message,
+    "SpeechStarted": _ignore_message,
+}
+
+
+# Transcript callbacks may be plain functions or coroutine functions
+TranscriptCallback = Callable[[TranscriptEvent], None | Awaitable[None]]
+
+
 class DeepgramSTT:
     """Real-time speech-to-text using Deepgram's WebSocket API."""
 
     def __init__(self):
         self._ws: ClientConnection | None = None
         self._receive_task: asyncio.Task | None = None
-        self._transcript_callback: Callable[[TranscriptEvent], None] | None = None
+        self._transcript_callback: TranscriptCallback | None = None
+        # Async callbacks run in order on a dispatch task, off the receive loop
+        self._transcript_queue: asyncio.Queue[TranscriptEvent] = asyncio.Queue()
+        self._dispatch_task: asyncio.Task | None = None
         self._connected = asyncio.Event()
         self._closed = False
-
-    async def connect(self, on_transcript: Callable[[TranscriptEvent], None]) -> None:
+        self._callback_is_async = False
+        self._messages_skipped = 0  # non-transcript messages not parsed
+        self._last_interim_text = ""
+        self._audio_chunks_sent = 0
+
+        # Outbound audio, sent in batches by a single writer task
+        self._out_q: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=128)
+        self._writer_task: asyncio.Task | None = None
+        # Reused for every batch; never resized, so views of it stay valid
+        self._send_buf = bytearray(_SEND_BUF_BYTES)
+        self._send_view = memoryview(self._send_buf)
+
+    async def connect(self, on_transcript: TranscriptCallback) -> None:
         """
         Connect to Deepgram STT WebSocket.
 
         Args:
-            on_transcript: Callback function called for each transcript event.
+            on_transcript: Callback (plain or async) called for each transcript event.
         """
         self._transcript_callback = on_transcript
+        self._callback_is_async = inspect.iscoroutinefunction(on_transcript)
         self._closed = False
 
         # Validate API key is present
@@ -64,6 +140,8 @@ class DeepgramSTT:
                 additional_headers=headers,
                 ping_interval=20,
                 ping_timeout=10,
+                # Small JSON in, mulaw audio out - deflate costs CPU for no gain
+                compression=None,
             )
         except websockets.exceptions.InvalidStatus as e:
             if e.response.status_code == 403:
@@ -79,27 +157,59 @@ class DeepgramSTT:
 
         # Start receiving transcripts in background
         self._receive_task = asyncio.create_task(self._receive_loop())
+        if self._callback_is_async:
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+        self._writer_task = asyncio.create_task(self._writer_loop())
 
     async def _receive_loop(self) -> None:
         """Background task to receive and process transcripts."""
         if not self._ws:
             return
 
+        loop = asyncio.get_running_loop()
+
         try:
-            async for message in self._ws:
-                if self._closed:
-                    break
+            while not self._closed:
+                # Raw bytes: skips UTF-8 decoding, and orjson parses bytes directly
+                message = await self._ws.recv(decode=False)
+
+                # Only Results/UtteranceEnd matter to _parse_transcript, so
+                # skip parsing Metadata, SpeechStarted etc. entirely
+                if _RESULTS_MARKER not in message and _UTTERANCE_END_MARKER not in message:
+                    self._messages_skipped += 1
+                    continue
 
                 try:
-                    data = json.loads(message)
-                    msg_type = data.get("type", "unknown")
-                    logger.debug(f"Deepgram message: {msg_type}")
+                    data = orjson.loads(message)
+                    # Lazy %-formatting: these run for every message, so skip
+                    # building the strings when the level is disabled
+                    logger.debug("Deepgram message: %s", data.get("type", "unknown"))
 
                     event = self._parse_transcript(data)
-                    if event and self._transcript_callback:
-                        logger.info(f"Transcript: '{event.text}' (final={event.is_final}, speech_final={event.speech_final})")
-                        self._transcript_callback(event)
-                except json.JSONDecodeError:
+                    if event is None:
+                        continue
+
+                    # Interim results often repeat; only pass on changes
+                    if event.is_final:
+                        self._last_interim_text = ""
+                    elif event.text == self._last_interim_text:
+                        continue
+                    else:
+                        self._last_interim_text = event.text
+
+                    if self._transcript_callback:
+                        logger.debug(
+                            "Transcript: '%s' (final=%s, speech_final=%s)",
+                            event.text,
+                            event.is_final,
+                            event.speech_final,
+                        )
+                        # Hand off so the callback never delays the next recv
+                        if self._callback_is_async:
+                            self._transcript_queue.put_nowait(event)
+                        else:
+                            loop.call_soon(self._transcript_callback, event)
+                except orjson.JSONDecodeError:
                     logger.warning(f"Failed to parse Deepgram message: {message[:100]}")
                 except Exception as e:
                     logger.error(f"Error processing transcript: {e}")
@@ -109,34 +219,19 @@ class DeepgramSTT:
         except Exception as e:
             logger.error(f"Error in STT receive loop: {e}")
 
+    async def _dispatch_loop(self) -> None:
+        """Background task that runs an async transcript callback, in order."""
+        while True:
+            event = await self._transcript_queue.get()
+            try:
+                await self._transcript_callback(event)
+            except Exception as e:
+                logger.error(f"Error in transcript callback: {e}")
+
     def _parse_transcript(self, data: dict) -> TranscriptEvent | None:
         """Parse a Deepgram response into a TranscriptEvent."""
-        msg_type = data.get("type")
-
-        if msg_type == "Results":
-            channel = data.get("channel", {})
-            alternatives = channel.get("alternatives", [])
-
-            if not alternatives:
-                return None
-
-            transcript = alternatives[0].get("transcript", "").strip()
-            if not transcript:
-                return None
-
-            return TranscriptEvent(
-                text=transcript,
-                is_final=data.get("is_final", False),
-                speech_final=data.get("speech_final", False),
-                confidence=alternatives[0].get("confidence", 0.0),
-            )
-
-        elif msg_type == "UtteranceEnd":
-            # This signals the end of a speech turn
-            logger.debug("Utterance end detected")
-            return None
-
-        return None
+        parser = _MESSAGE_PARSERS.get(data.get("type"))
+        return parser(data) if parser is not None else None
 
     async def send_audio(self, audio_data: bytes) -> None:
         """
@@ -147,48 +242,124 @@ class DeepgramSTT:
         """
         await self._connected.wait()
 
+        self._audio_chunks_sent += 1
+        # Power-of-two mask keeps the progress check cheap (every 128 chunks)
+        if not self._audio_chunks_sent & 127 and logger.isEnabledFor(logging.INFO):
+            logger.info(f"Audio chunks sent to Deepgram: {self._audio_chunks_sent}")
+
         if self._ws and not self._closed:
+            # A dead writer would never drain the queue - drop the audio
+            # rather than block the Twilio message loop forever
+            if self._writer_task is None or self._writer_task.done():
+                return
             try:
-                await self._ws.send(audio_data)
-            except websockets.ConnectionClosed:
-                logger.warning("Cannot send audio: connection closed")
+                self._out_q.put_nowait(audio_data)
+            except asyncio.QueueFull:
+                # Writer is falling behind - wait for room
+                await self._out_q.put(audio_data)
+
+    async def _writer_loop(self) -> None:
+        """Background task that merges queued audio into batched sends."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            audio_data = await self._out_q.get()
+            if audio_data is None:
+                return
+
+            # Merge whatever else arrives before the batch is full or due
+            parts = [audio_data]
+            size = len(audio_data)
+            deadline = loop.time() + _SEND_MAX_DELAY
+            stopping = False
+            while size < _SEND_BATCH_BYTES:
+                try:
+                    audio_data = await asyncio.wait_for(
+                        self._out_q.get(), deadline - loop.time()
+                    )
+                except TimeoutError:
+                    break
+                if audio_data is None:
+                    stopping = True
+                    break
+                parts.append(audio_data)
+                size += len(audio_data)
 
-    _audio_chunks_sent: int = 0
+            await self._send_batch(parts, size)
 
-    async def send_audio_base64(self, audio_base64: str) -> None:
+            if stopping:
+                return
+
+    async def _send_batch(self, parts: list[bytes], size: int) -> None:
+        """Send batched audio chunks to Deepgram as one message."""
+        if not self._ws:
+            return
+
+        if len(parts) == 1:
+            data = parts[0]
+        elif size <= len(self._send_buf):
+            # Copy into the preallocated buffer and send a view of it
+            offset = 0
+            for part in parts:
+                self._send_view[offset : offset + len(part)] = part
+                offset += len(part)
+            data = self._send_view[:size]
+        else:
+            data = b"".join(parts)
+
+        try:
+            await self._ws.send(data)
+        except websockets.ConnectionClosed:
+            logger.warning("Cannot send audio: connection closed")
+        except Exception as e:
+            # Drop this batch but keep the writer alive for the next one
+            logger.error(f"Error sending audio to Deepgram: {e}")
+
+    async def send_audio_base64(self, audio_base64: str | bytes) -> None:
         """
         Send base64-encoded audio data to Deepgram.
 
         Args:
-            audio_base64: Base64-encoded audio (from Twilio).
+            audio_base64: Base64-encoded audio (from Twilio), as str or ASCII bytes.
         """
-        audio_data = base64.b64decode(audio_base64)
-        self._audio_chunks_sent += 1
-        if self._audio_chunks_sent % 100 == 0:
-            logger.info(f"Audio chunks sent to Deepgram: {self._audio_chunks_sent}")
+        audio_data = binascii.a2b_base64(audio_base64)
         await self.send_audio(audio_data)
 
     async def close(self) -> None:
         """Close the Deepgram connection."""
         self._closed = True
 
+        if self._writer_task:
+            # Let the writer send what's already queued, then stop
+            try:
+                self._out_q.put_nowait(None)
+                await asyncio.wait_for(self._writer_task, _WRITER_CLOSE_TIMEOUT)
+            except (asyncio.QueueFull, TimeoutError):
+                self._writer_task.cancel()
+            except Exception as e:
+                logger.warning(f"Error in STT audio writer: {e}")
+            self._writer_task = None
+
         if self._ws:
             try:
                 # Send close message to Deepgram
-                await self._ws.send(json.dumps({"type": "CloseStream"}))
+                await self._ws.send(_CLOSE_FRAME)
                 await self._ws.close()
             except Exception as e:
                 logger.warning(f"Error closing Deepgram connection: {e}")
             finally:
                 self._ws = None
 
-        if self._receive_task:
-            self._receive_task.cancel()
-            try:
-                await self._receive_task
-            except asyncio.CancelledError:
-                pass
-            self._receive_task = None
+        for task in (self._receive_task, self._dispatch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._receive_task = None
+        self._dispatch_task = None
 
         self._connected.clear()
+        logger.debug(f"Skipped {self._messages_skipped} non-transcript Deepgram messages")
         logger.info("Deepgram STT connection closed")
@@ -4,21 +4,44 @@ import logging
 from typing import AsyncIterator
 
 import httpx
+import orjson
 
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _create_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for TTS requests."""
+    return httpx.AsyncClient(
+        # Set once on the client instead of being rebuilt for every request
+        headers={
+            "Authorization": f"Token {settings.deepgram_api_key}",
+            "Content-Type": "application/json",
+            "Accept-Encoding": "identity",  # mulaw doesn't compress
+        },
+        # Concurrent synth requests share one multiplexed connection
+        http2=True,
+        timeout=httpx.Timeout(connect=5.0, read=30.0, write=5.0, pool=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=4,
+            max_connections=8,
+            keepalive_expiry=300.0,
+        ),
+    )
+
+
 class DeepgramTTS:
     """Text-to-speech using Deepgram's Aura API."""
 
     def __init__(self):
-        self._client: httpx.AsyncClient | None = None
+        # Long-lived client so every request reuses a warm TLS connection
+        self._client: httpx.AsyncClient | None = _create_client()
 
     async def __aenter__(self) -> "DeepgramTTS":
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(timeout=30.0)
+        if not self._client:
+            self._client = _create_client()
         return self
 
     async def __aexit__(self, *args) -> None:
@@ -37,22 +60,16 @@ class DeepgramTTS:
         Returns:
             Audio data as bytes (mulaw encoded, 8kHz).
         """
-        if not self._client:
-            self._client = httpx.AsyncClient(timeout=30.0)
+        client = self._get_client()
 
-        headers = {
-            "Authorization": f"Token {settings.deepgram_api_key}",
-            "Content-Type": "application/json",
-        }
-
-        payload = {"text": text}
+        # Serialized up front; orjson returns the bytes httpx sends as-is
+        body = orjson.dumps({"text": text})
 
         logger.debug(f"TTS request: {text[:50]}...")
 
-        response = await self._client.post(
+        response = await client.post(
             settings.deepgram_tts_url,
-            headers=headers,
-            json=payload,
+            content=body,
         )
 
         if response.status_code != 200:
@@ -75,32 +92,34 @@ class DeepgramTTS:
         Yields:
             Audio data chunks (mulaw encoded, 8kHz).
         """
-        if not self._client:
-            self._client = httpx.AsyncClient(timeout=30.0)
+        client = self._get_client()
 
-        headers = {
-            "Authorization": f"Token {settings.deepgram_api_key}",
-            "Content-Type": "application/json",
-        }
-
-        payload = {"text": text}
+        # Serialized up front; orjson returns the bytes httpx sends as-is
+        body = orjson.dumps({"text": text})
 
         logger.debug(f"TTS streaming request: {text[:50]}...")
 
-        async with self._client.stream(
+        async with client.stream(
             "POST",
             settings.deepgram_tts_url,
-            headers=headers,
-            json=payload,
+            content=body,
         ) as response:
             if response.status_code != 200:
                 error_text = await response.aread()
                 logger.error(f"TTS error: {response.status_code} - {error_text}")
                 raise Exception(f"TTS failed: {response.status_code}")
 
-            async for chunk in response.aiter_bytes(chunk_size=1024):
+            # Yield data as the transport delivers it; the caller re-slices
+            # it into Twilio-sized frames
+            async for chunk in response.aiter_bytes():
                 yield chunk
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, failing if it has been closed."""
+        if not self._client:
+            raise RuntimeError("TTS client is closed")
+        return self._client
+
     async def close(self) -> None:
         """Close the HTTP client."""
         if self._client:
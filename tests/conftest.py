@@ -0,0 +1,7 @@
+"""Shared test setup."""
+
+import os
+
+# src.config builds its settings at import time and requires the API keys
+os.environ.setdefault("DEEPGRAM_API_KEY", "test-deepgram-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
@@ -0,0 +1,102 @@
+"""Tests for sentence splitting in the conversation brain."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.brain import Conversation, OpenAIBrain
+
+
+def _chunk(content: str | None) -> SimpleNamespace:
+    """Build an object shaped like an OpenAI streaming chunk."""
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions, streaming fixed tokens."""
+
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+
+    async def create(self, **kwargs):
+        assert kwargs["stream"] is True
+
+        async def stream():
+            for token in self.tokens:
+                yield _chunk(token)
+            # The final chunk of a real stream carries no content
+            yield _chunk(None)
+
+        return stream()
+
+
+async def _sentences(tokens: list[str]) -> list[str]:
+    """Run respond_by_sentence over a fake token stream."""
+    brain = OpenAIBrain()
+    brain._client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(tokens)))
+    return [s async for s in brain.respond_by_sentence(Conversation(system_prompt="test"))]
+
+
+def test_api_format_is_a_copy():
+    conversation = Conversation(system_prompt="test")
+    conversation.add_user_message("Hello")
+
+    messages = conversation.to_api_format()
+    messages.append({"role": "system", "content": "one-off hint"})
+
+    assert conversation.to_api_format() == [
+        {"role": "system", "content": "test"},
+        {"role": "user", "content": "Hello"},
+    ]
+
+
+def _split_every(text: str, size: int) -> list[str]:
+    """Split text into tokens of a fixed number of characters."""
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.asyncio
+async def test_abbreviation_does_not_end_sentence():
+    tokens = ["Dr. Smith called.", " He said", " hi to you."]
+    assert await _sentences(tokens) == ["Dr. Smith called.", "He said hi to you."]
+
+
+@pytest.mark.asyncio
+async def test_short_sentences_are_merged():
+    tokens = ["Hi. Ok. ", "Let me check that for you.", " Bye now."]
+    assert await _sentences(tokens) == ["Hi. Ok. Let me check that for you.", "Bye now."]
+
+
+@pytest.mark.asyncio
+async def test_decimal_is_not_split():
+    tokens = ["It costs 3", ".", "5 dollars today.", " Thanks."]
+    assert await _sentences(tokens) == ["It costs 3.5 dollars today.", "Thanks."]
+
+
+@pytest.mark.asyncio
+async def test_newline_ends_sentence():
+    tokens = ["Sure thing, yes.", "\nAnything else", " for you?"]
+    assert await _sentences(tokens) == ["Sure thing, yes.", "Anything else for you?"]
+
+
+@pytest.mark.asyncio
+async def test_trailing_text_without_punctuation_is_yielded():
+    assert await _sentences(["Let me think", " about that"]) == ["Let me think about that"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 1000])
+async def test_output_independent_of_token_split(size):
+    text = (
+        "Hi. Dr. Smith says the fee is 3.5 dollars.\n"
+        "Is that ok? Great! Mr. Jones will call back... later today. Bye"
+    )
+    expected = [
+        "Hi. Dr. Smith says the fee is 3.5 dollars.",
+        "Is that ok?",
+        "Great! Mr. Jones will call back...",
+        "later today.",
+        "Bye",
+    ]
+    assert await _sentences(_split_every(text, size)) == expected
@@ -0,0 +1,42 @@
+"""Tests for call handler audio helpers."""
+
+import pytest
+
+from src.call_handler import _split_audio
+
+
+async def _stream(chunks: list[bytes]):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _frames(chunks: list[bytes], chunk_size: int) -> list[bytes]:
+    return [bytes(frame) async for frame in _split_audio(_stream(chunks), chunk_size)]
+
+
+@pytest.mark.asyncio
+async def test_split_audio_rechunks_uneven_input():
+    data = bytes(range(256)) * 4
+    # Chunks smaller than, equal to, and spanning several frames
+    sizes = [3, 10, 1, 64, 7, 200, 0, 150, 589]
+    chunks = []
+    offset = 0
+    for size in sizes:
+        chunks.append(data[offset : offset + size])
+        offset += size
+    assert offset == len(data)
+
+    frames = await _frames(chunks, 64)
+
+    assert b"".join(frames) == data
+    assert [len(f) for f in frames] == [64] * (len(data) // 64)
+
+
+@pytest.mark.asyncio
+async def test_split_audio_keeps_short_tail():
+    assert await _frames([b"abcde", b"fg"], 3) == [b"abc", b"def", b"g"]
+
+
+@pytest.mark.asyncio
+async def test_split_audio_empty_stream():
+    assert await _frames([], 640) == []
@@ -0,0 +1,163 @@
+"""Tests for batched audio sending in the Deepgram STT client."""
+
+import asyncio
+
+import pytest
+
+from src.stt import (
+    _CLOSE_FRAME,
+    _SEND_BATCH_BYTES,
+    _SEND_BUF_BYTES,
+    _SEND_MAX_DELAY,
+    DeepgramSTT,
+)
+
+# 20ms of 8kHz mulaw, the size of one Twilio media frame
+FRAME = 160
+
+
+class FakeWebSocket:
+    """Records sent frames; like websockets, data is serialized during send()."""
+
+    def __init__(self):
+        self.sent: list[bytes | str] = []
+        self.raw: list[object] = []  # objects as passed to send()
+        self.fail_sends = 0
+        self.closed = False
+
+    async def send(self, data) -> None:
+        if self.fail_sends:
+            self.fail_sends -= 1
+            raise RuntimeError("send failed")
+        self.raw.append(data)
+        self.sent.append(data if isinstance(data, str) else bytes(data))
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _connect(stt: DeepgramSTT) -> FakeWebSocket:
+    """Attach a fake socket and start the writer, as connect() would."""
+    ws = FakeWebSocket()
+    stt._ws = ws
+    stt._connected.set()
+    stt._writer_task = asyncio.create_task(stt._writer_loop())
+    return ws
+
+
+async def _wait_for_sends(ws: FakeWebSocket, count: int) -> None:
+    async def wait():
+        while len(ws.sent) < count:
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(wait(), 1.0)
+
+
+def _frame(n: int) -> bytes:
+    """A frame filled with a byte unique to n, so batches can be told apart."""
+    return bytes([n]) * FRAME
+
+
+@pytest.mark.asyncio
+async def test_frames_merge_into_batches():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+
+    frames = [_frame(n) for n in range(9)]
+    for frame in frames:
+        await stt.send_audio(frame)
+    await _wait_for_sends(ws, 3)
+
+    assert all(len(data) <= _SEND_BATCH_BYTES for data in ws.sent)
+    assert [len(data) for data in ws.sent] == [480, 480, 480]
+    assert b"".join(ws.sent) == b"".join(frames)
+
+    await stt.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_sent_after_max_delay():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+
+    await stt.send_audio(_frame(1))
+    await asyncio.sleep(_SEND_MAX_DELAY / 4)
+    assert ws.sent == []
+
+    await _wait_for_sends(ws, 1)
+    assert ws.sent == [_frame(1)]
+
+    await stt.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_queued_audio_before_close_frame():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+
+    await stt.send_audio(_frame(1))
+    await stt.send_audio(_frame(2))
+    await stt.close()
+
+    assert ws.sent == [_frame(1) + _frame(2), _CLOSE_FRAME]
+    assert ws.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_send_drops_only_that_batch():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+    ws.fail_sends = 1
+
+    for n in range(3):
+        await stt.send_audio(_frame(n))
+    await asyncio.sleep(_SEND_MAX_DELAY / 4)
+    assert ws.fail_sends == 0  # the batch was attempted and failed
+    assert ws.sent == []
+    assert not stt._writer_task.done()
+
+    for n in range(3, 6):
+        await stt.send_audio(_frame(n))
+    await _wait_for_sends(ws, 1)
+
+    assert ws.sent == [_frame(3) + _frame(4) + _frame(5)]
+    assert not stt._writer_task.done()
+
+    await stt.close()
+
+
+@pytest.mark.asyncio
+async def test_consecutive_buffered_batches_keep_their_bytes():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+
+    first = [_frame(n) for n in range(3)]
+    second = [_frame(n) for n in range(3, 6)]
+    for frame in first + second:
+        await stt.send_audio(frame)
+    await _wait_for_sends(ws, 2)
+
+    # Both batches went through the shared buffer...
+    assert all(isinstance(data, memoryview) for data in ws.raw)
+    assert all(data.obj is stt._send_buf for data in ws.raw)
+    # ...and each was sent with its own bytes, not the later batch's
+    assert ws.sent == [b"".join(first), b"".join(second)]
+
+    await stt.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_larger_than_buffer_is_joined():
+    stt = DeepgramSTT()
+    ws = _connect(stt)
+
+    small = b"a" * (_SEND_BATCH_BYTES - 1)
+    large = b"b" * _SEND_BUF_BYTES
+    await stt.send_audio(small)
+    await stt.send_audio(large)
+    await _wait_for_sends(ws, 1)
+
+    assert ws.sent == [small + large]
+    assert isinstance(ws.raw[0], bytes)
+
+    await stt.close()